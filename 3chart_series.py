@@ -0,0 +1,207 @@
+# ============================================================================
+# 3chart_series.py
+# 대시보드용 차트 시리즈 사전 계산 (LTTB 다운샘플링 + 오차 통계 + 환전 추천 입력값)
+# 테스트 기간이 길어져도 브라우저가 받는 데이터 크기는 해상도별 포인트 수로 고정
+# ============================================================================
+
+import numpy as np
+
+# 해상도 이름 → 목표 포인트 수 (대시보드가 화면 폭에 맞는 하나만 가져감)
+CHART_RESOLUTIONS = {
+    'n60': 60,
+    'n120': 120,
+    'n240': 240,
+}
+
+# 소수점 자릿수 (원 단위 환율은 2자리면 충분)
+ROUND_DIGITS = 2
+
+
+def lttb_downsample(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링
+    - 첫 점과 마지막 점은 항상 유지
+    - 전체 최솟값/최댓값(극값)도 해당 버킷의 선택점을 대체하여 반드시 유지
+    반환값: 선택된 원본 인덱스 배열 (오름차순)
+    """
+    if n_out < 3:
+        raise ValueError(f"n_out은 3 이상이어야 합니다 (첫 점 + 마지막 점 + 버킷 1개): {n_out}")
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+
+    if n_out >= n:
+        return np.arange(n)
+
+    # 첫/마지막 점을 제외한 나머지를 (n_out - 2)개 버킷으로 분할
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # 다음 버킷의 평균점 (마지막 버킷이면 마지막 점)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        # 이전 선택점 a, 후보점, 다음 버킷 평균점이 이루는 삼각형 넓이가 최대인 점 선택
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    # 극값 보존: 극값이 속한 버킷의 선택점을 극값으로 교체
+    # (최솟값과 최댓값이 같은 버킷이면 두 번째 극값은 추가 포인트로 유지)
+    extremes = (int(np.argmin(y)), int(np.argmax(y)))
+    extra = []
+    for extreme in extremes:
+        if extreme in selected:
+            continue
+        bucket = int(np.searchsorted(edges, extreme, side='right')) - 1
+        if selected[bucket + 1] in extremes:
+            extra.append(extreme)
+        else:
+            selected[bucket + 1] = extreme
+
+    return np.unique(np.concatenate([selected, extra]).astype(int))
+
+
+def compute_error_stats(actual, predicted):
+    """예측 오차 통계 (실제 - 예측, 단위: 원)"""
+    actual = np.asarray(actual, dtype=float)
+    predicted = np.asarray(predicted, dtype=float)
+    errors = actual - predicted
+
+    return {
+        'rmse': float(np.sqrt(np.mean(errors ** 2))),
+        'mae': float(np.mean(np.abs(errors))),
+        'mape': float(np.mean(np.abs(errors / actual)) * 100),
+        'mean_error': float(np.mean(errors)),
+        'max_abs_error': float(np.max(np.abs(errors))),
+    }
+
+
+def compute_travel_inputs(predicted, forecast_days=7):
+    """
+    환전 시점 추천 입력값 (대시보드 analyzePrediction()에서 사용)
+    - 예측 시리즈의 마지막 forecast_days개를 미래 구간으로 간주
+    """
+    future = np.asarray(predicted, dtype=float)[-forecast_days:]
+    min_index = int(np.argmin(future))
+
+    return {
+        'future_rates': [round(float(v), ROUND_DIGITS) for v in future],
+        'min_rate': round(float(future[min_index]), ROUND_DIGITS),
+        'min_rate_index': min_index,
+        'max_rate': round(float(future.max()), ROUND_DIGITS),
+        'avg_rate': round(float(future.mean()), ROUND_DIGITS),
+    }
+
+
+def _series_points(x_ms, y, n_out):
+    """LTTB로 고른 점을 Firestore 저장용 평행 배열로 변환 (중첩 배열 미지원)"""
+    idx = lttb_downsample(x_ms, y, n_out)
+    return {
+        'x': [int(x_ms[i]) for i in idx],
+        'y': [round(float(y[i]), ROUND_DIGITS) for i in idx],
+    }
+
+
+def build_chart_documents(dates, actual, predicted, forecast_days=7, resolutions=CHART_RESOLUTIONS):
+    """
+    해상도별 차트 문서 생성
+    - x: 날짜의 UTC 자정 epoch milliseconds (대시보드도 UTC 기준으로 날짜 표시)
+    - 실제/예측 시리즈는 각각 독립적으로 LTTB 적용 (각자의 극값 유지)
+    반환값: {해상도 이름: 문서 dict}
+    """
+    actual = np.asarray(actual, dtype=float).flatten()
+    predicted = np.asarray(predicted, dtype=float).flatten()
+    x_ms = np.array([int(np.datetime64(d, 'ms').astype('int64')) for d in dates])
+
+    error_stats = compute_error_stats(actual, predicted)
+    travel_inputs = compute_travel_inputs(predicted, forecast_days)
+
+    documents = {}
+    for name, n_out in resolutions.items():
+        documents[name] = {
+            'resolution': name,
+            'source_count': len(actual),
+            'actual': _series_points(x_ms, actual, n_out),
+            'predicted': _series_points(x_ms, predicted, n_out),
+            'error_stats': error_stats,
+            'travel': travel_inputs,
+        }
+    return documents
+
+
+def publish_prediction(prediction_data, dates, actual, predicted):
+    """
+    훈련 결과 발행 (3train.ipynb / 3train_FIXED.ipynb 공통)
+    1. 해상도별 차트 문서를 prediction_charts 컬렉션에 한 번에(batch) 저장
+    2. 전체 예측 결과를 prediction_history에 저장 (firebase_config)
+    대시보드는 prediction_charts를 먼저 읽으므로, 차트 저장이 실패하면
+    prediction_history도 저장하지 않고 예외를 그대로 올려 실행을 실패시킨다.
+    """
+    # firebase_config import 시 Firebase 앱이 초기화됨 (firebase-key.json)
+    from firebase_config import save_prediction_to_firestore
+    from firebase_admin import firestore
+
+    chart_documents = build_chart_documents(
+        dates, actual, predicted, forecast_days=prediction_data['forecast_days']
+    )
+
+    try:
+        db = firestore.client()
+        batch = db.batch()
+        for resolution, chart_doc in chart_documents.items():
+            chart_doc.update({
+                'trained_date': prediction_data['trained_date'],
+                'model_type': prediction_data['model_type'],
+                'r2_score': prediction_data['r2_score'],
+            })
+            batch.set(db.collection('prediction_charts').document(resolution), chart_doc)
+        batch.commit()
+    except Exception as e:
+        print("❌" * 20)
+        print(f"❌ 차트 시리즈 저장 실패: {e}")
+        print("❌ 대시보드가 이전 훈련 결과를 계속 표시합니다. prediction_history 저장도 중단합니다.")
+        print("❌" * 20)
+        raise
+
+    print(f"✅ 차트 시리즈 저장 완료: {list(chart_documents.keys())} "
+          f"({len(actual)}개 → 해상도별 다운샘플링)")
+
+    save_prediction_to_firestore(prediction_data)
+
+
+if __name__ == "__main__":
+    # 예시 데이터: 1000일치 랜덤워크
+    rng = np.random.default_rng(0)
+    dates = np.arange('2020-01-01', '2022-09-27', dtype='datetime64[D]')
+    actual = 1200 + np.cumsum(rng.normal(0, 5, len(dates)))
+    predicted = actual + rng.normal(0, 10, len(dates))
+
+    docs = build_chart_documents(dates, actual, predicted)
+    for name, doc in docs.items():
+        assert len(doc['actual']['y']) <= CHART_RESOLUTIONS[name] + 1
+        assert max(doc['actual']['y']) == round(actual.max(), ROUND_DIGITS)
+        assert min(doc['actual']['y']) == round(actual.min(), ROUND_DIGITS)
+        print(f"{name}: {doc['source_count']} → {len(doc['actual']['y'])} points")
+
+    try:
+        lttb_downsample(np.arange(10), np.arange(10), 2)
+        raise AssertionError("n_out < 3 에서 ValueError가 발생해야 함")
+    except ValueError:
+        pass
+    print("✅ 차트 시리즈 생성 테스트 완료")